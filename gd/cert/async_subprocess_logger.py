@@ -82,7 +82,8 @@ class AsyncSubprocessLogger:
         if tagLength < self.PROCESS_TAG_MIN_WIDTH:
             loggableTag += " " * (self.PROCESS_TAG_MIN_WIDTH - tagLength)
         with ExitStack() as stack:
-            log_files = [stack.enter_context(open(file_path, 'w')) for file_path in self.log_file_paths]
+            # Line buffered so that the last lines before a timeout or crash are already on disk
+            log_files = [stack.enter_context(open(file_path, 'w', buffering=1)) for file_path in self.log_file_paths]
             for line in self.process.stdout:
                 for log_file in log_files:
                     log_file.write(line)
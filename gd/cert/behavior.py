@@ -15,11 +15,10 @@
 #   limitations under the License.
 
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from datetime import timedelta
 from mobly import signals
 from threading import Condition
 
-from cert.event_stream import static_remaining_time_delta
 from cert.truth import assertThat
 
 
@@ -89,15 +88,12 @@ class SingleArgumentBehavior(object):
         self._invoked_condition.release()
 
     def wait_until_invoked(self, matcher, times, timeout):
-        end_time = datetime.now() + timeout
-        invoked_times = 0
-        while datetime.now() < end_time and invoked_times < times:
-            remaining = static_remaining_time_delta(end_time)
-            invoked_times = sum((matcher(i) for i in self._invoked_obj))
-            self._invoked_condition.acquire()
-            self._invoked_condition.wait(remaining.total_seconds())
-            self._invoked_condition.release()
-        return invoked_times == times
+        with self._invoked_condition:
+            self._invoked_condition.wait_for(lambda: self.__count_invoked(matcher) >= times, timeout.total_seconds())
+            return self.__count_invoked(matcher) == times
+
+    def __count_invoked(self, matcher):
+        return sum((matcher(i) for i in self._invoked_obj))
 
 
 class PersistenceStage(object):
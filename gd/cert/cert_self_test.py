@@ -15,6 +15,7 @@
 #   limitations under the License.
 
 from datetime import datetime, timedelta
+import inspect
 import logging
 from threading import Timer
 import time
@@ -25,8 +26,6 @@ from mobly import asserts
 from acts import signals
 from acts.base_test import BaseTestClass
 
-from bluetooth_packets_python3 import hci_packets
-from bluetooth_packets_python3 import l2cap_packets
 from cert.event_stream import EventStream, FilteringEventStream
 from cert.truth import assertThat
 from cert.metadata import metadata
@@ -35,109 +34,44 @@ from cert.behavior import IHasBehaviors
 from cert.behavior import anything
 from cert.behavior import SingleArgumentBehavior
 from cert.behavior import ReplyStage
-from cert.cert_self_test_lib import *
+import cert.cert_self_test_lib
 
 
-class CertSelfTest(BaseTestClass):
-
-    def setup_test(self):
-        return True
-
-    def teardown_test(self):
-        return True
-
-    def test_assert_occurs_at_least_passes(self):
-        test_assert_occurs_at_least_passes_core()
-
-    def test_assert_occurs_passes(self):
-        test_assert_occurs_passes_core()
-
-    def test_assert_occurs_fails(self):
-        test_assert_occurs_fails_core()
-
-    def test_assert_occurs_at_most_passes(self):
-        test_assert_occurs_at_most_passes_core()
-
-    def test_assert_occurs_at_most_fails(self):
-        test_assert_occurs_at_most_fails_core()
-
-    def test_skip_a_test(self):
-        test_skip_a_test_core()
-
-    def test_nested_packets(self):
-        test_nested_packets_core()
-
-    def test_l2cap_config_options(self):
-        test_l2cap_config_options_core()
-
-    def test_assertThat_boolean_success(self):
-        test_assertThat_boolean_success_core()
-
-    def test_assertThat_boolean_falseIsTrue(self):
-        test_assertThat_boolean_falseIsTrue_core()
-
-    def test_assertThat_boolean_trueIsFalse(self):
-        test_assertThat_boolean_trueIsFalse_core()
-
-    def test_assertThat_object_success(self):
-        test_assertThat_object_success_core()
-
-    def test_assertThat_object_isEqualToFails(self):
-        test_assertThat_object_isEqualToFails_core()
-
-    def test_assertThat_object_isNotEqualToFails(self):
-        test_assertThat_object_isNotEqualToFails_core()
-
-    def test_assertThat_object_isNoneFails(self):
-        test_assertThat_object_isNoneFails_core()
-
-    def test_assertThat_object_isNotNoneFails(self):
-        test_assertThat_object_isNotNoneFails_core()
-
-    def test_assertThat_eventStream_emits_passes(self):
-        test_assertThat_eventStream_emits_passes_core()
-
-    def test_assertThat_eventStream_emits_then_passes(self):
-        test_assertThat_eventStream_emits_then_passes_core()
-
-    def test_assertThat_eventStream_emits_fails(self):
-        test_assertThat_eventStream_emits_fails_core()
+def delegate_core_tests(core_module):
+    """
+    Class decorator adding a test_<name> method for every test_<name>_core
+    function in core_module that the class does not define by itself, so a
+    new core test cannot be forgotten in the test class
+    """
 
-    def test_assertThat_eventStream_emits_then_fails(self):
-        test_assertThat_eventStream_emits_then_fails_core()
+    def make_test(test_name, core):
 
-    def test_assertThat_eventStream_emitsInOrder_passes(self):
-        test_assertThat_eventStream_emitsInOrder_passes_core()
+        def test(self):
+            core()
 
-    def test_assertThat_eventStream_emitsInAnyOrder_passes(self):
-        test_assertThat_eventStream_emitsInAnyOrder_passes_core()
+        test.__name__ = test_name
+        return test
 
-    def test_assertThat_eventStream_emitsInOrder_fails(self):
-        test_assertThat_eventStream_emitsInOrder_fails_core()
+    def decorator(cls):
+        for name, core in inspect.getmembers(core_module, inspect.isfunction):
+            if not name.startswith("test_") or not name.endswith("_core"):
+                continue
+            test_name = name[:-len("_core")]
+            if not hasattr(cls, test_name):
+                setattr(cls, test_name, make_test(test_name, core))
+        return cls
 
-    def test_assertThat_eventStream_emitsInAnyOrder_fails(self):
-        test_assertThat_eventStream_emitsInAnyOrder_fails_core()
+    return decorator
 
-    def test_assertThat_emitsNone_passes(self):
-        test_assertThat_emitsNone_passes_core()
 
-    def test_assertThat_emitsNone_passes_after_1_second(self):
-        test_assertThat_emitsNone_passes_after_1_second_core()
-
-    def test_assertThat_emitsNone_fails(self):
-        test_assertThat_emitsNone_fails_core()
-
-    def test_assertThat_emitsNone_zero_passes(self):
-        test_assertThat_emitsNone_zero_passes_core()
-
-    def test_assertThat_emitsNone_zero_passes_after_one_second(self):
-        test_assertThat_emitsNone_zero_passes_after_one_second_core()
+@delegate_core_tests(cert.cert_self_test_lib)
+class CertSelfTest(BaseTestClass):
 
-    def test_assertThat_emitsNone_zero_fails(self):
-        test_assertThat_emitsNone_zero_fails_core()
+    def setup_test(self):
+        return True
 
-    def test_filtering_event_stream_none_filter_function(self):
-        test_filtering_event_stream_none_filter_function_core()
+    def teardown_test(self):
+        return True
 
     def test_metadata_empty(self):
 
@@ -238,54 +172,3 @@ class CertSelfTest(BaseTestClass):
                 msg="Failed test method not in error stack trace: %s" % trace_str)
         else:
             asserts.fail("Must throw an exception using @metadata decorator")
-
-    def test_fluent_behavior_simple(self):
-        test_fluent_behavior_simple_core()
-
-    def test_fluent_behavior__then_single__captures_one(self):
-        test_fluent_behavior__then_single__captures_one_core()
-
-    def test_fluent_behavior__then_times__captures_all(self):
-        test_fluent_behavior__then_times__captures_all_core()
-
-    def test_fluent_behavior__always__captures_all(self):
-        test_fluent_behavior__always__captures_all_core()
-
-    def test_fluent_behavior__matcher__captures_relevant(self):
-        test_fluent_behavior__matcher__captures_relevant_core()
-
-    def test_fluent_behavior__then_repeated__captures_relevant(self):
-        test_fluent_behavior__then_repeated__captures_relevant_core()
-
-    def test_fluent_behavior__fallback__captures_relevant(self):
-        test_fluent_behavior__fallback__captures_relevant_core()
-
-    def test_fluent_behavior__default_unhandled_crash(self):
-        test_fluent_behavior__default_unhandled_crash_core()
-
-    def test_fluent_behavior__set_default_works(self):
-        test_fluent_behavior__set_default_works_core()
-
-    def test_fluent_behavior__wait_until_done(self):
-        test_fluent_behavior__wait_until_done_core()
-
-    def test_fluent_behavior__wait_until_done_different_lambda(self):
-        test_fluent_behavior__wait_until_done_different_lambda_core()
-
-    def test_fluent_behavior__wait_until_done_anything(self):
-        test_fluent_behavior__wait_until_done_anything_core()
-
-    def test_fluent_behavior__wait_until_done_not_happened(self):
-        test_fluent_behavior__wait_until_done_not_happened_core()
-
-    def test_fluent_behavior__wait_until_done_with_default(self):
-        test_fluent_behavior__wait_until_done_with_default_core()
-
-    def test_fluent_behavior__wait_until_done_two_events_AA(self):
-        test_fluent_behavior__wait_until_done_two_events_AA_core()
-
-    def test_fluent_behavior__wait_until_done_two_events_AB(self):
-        test_fluent_behavior__wait_until_done_two_events_AB_core()
-
-    def test_fluent_behavior__wait_until_done_only_one_event_is_done(self):
-        test_fluent_behavior__wait_until_done_only_one_event_is_done_core()
@@ -14,16 +14,15 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from datetime import datetime, timedelta
+from collections import deque
+from datetime import timedelta
+from functools import lru_cache
 import logging
-from threading import Timer
-import time
+from threading import Event, Timer
 import traceback
 
 from mobly import asserts
 
-from bluetooth_packets_python3 import hci_packets
-from bluetooth_packets_python3 import l2cap_packets
 from cert.event_stream import EventStream, FilteringEventStream
 from cert.truth import assertThat
 from cert.metadata import metadata
@@ -56,39 +55,47 @@ class BogusProto:
 
     def __init__(self, value):
         self.value_ = value
-        self.DESCRIPTOR = BogusProto.BogusDescriptor(str(value))
+        self.DESCRIPTOR = _get_bogus_descriptor(str(value))
 
     def __str__(self):
         return "BogusRpc value = " + str(self.value_)
 
     def ListFields(self):
-        for field in [BogusProto.BogusType()]:
-            yield [field, self.value_]
+        return ((_BOGUS_TYPE, self.value_),)
+
+
+_BOGUS_TYPE = BogusProto.BogusType()
+
+
+@lru_cache(maxsize=None)
+def _get_bogus_descriptor(name):
+    return BogusProto.BogusDescriptor(name)
 
 
 class FetchEvents:
 
     def __init__(self, events, delay_ms):
-        self.events_ = events
+        self.events_ = deque(events)
         self.sleep_time_ = (delay_ms * 1.0) / 1000
-        self.index_ = 0
-        self.done_ = False
-        self.then_ = datetime.now()
+        self.cancelled_ = Event()
 
     def __iter__(self):
-        for event in self.events_:
-            time.sleep(self.sleep_time_)
-            if self.done_:
-                return
-            logging.debug("yielding %d" % event)
-            yield BogusProto(event)
+        return self
+
+    def __next__(self):
+        # Wakes up as soon as cancel() is called instead of sleeping through the delay
+        if not self.events_ or self.cancelled_.wait(self.sleep_time_):
+            raise StopIteration
+        event = self.events_.popleft()
+        logging.debug("yielding %d", event)
+        return BogusProto(event)
 
     def done(self):
-        return self.done_
+        return self.cancelled_.is_set()
 
     def cancel(self):
         logging.debug("cancel")
-        self.done_ = True
+        self.cancelled_.set()
         return None
 
 
@@ -173,6 +180,8 @@ def test_skip_a_test_core():
 
 
 def test_nested_packets_core():
+    # Packet library is only needed by the packet tests, don't load it for the others
+    from bluetooth_packets_python3 import hci_packets
     handle = 123
     inside = hci_packets.ReadScanEnableBuilder()
     logging.debug(inside.Serialize())
@@ -184,6 +193,8 @@ def test_nested_packets_core():
 
 
 def test_l2cap_config_options_core():
+    from bluetooth_packets_python3 import hci_packets
+    from bluetooth_packets_python3 import l2cap_packets
     mtu_opt = l2cap_packets.MtuConfigurationOption()
     mtu_opt.mtu = 123
     fcs_opt = l2cap_packets.FrameCheckSequenceOption()
@@ -16,9 +16,10 @@
 
 from abc import ABC, abstractmethod
 from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime, timedelta
+from datetime import timedelta
 import logging
 from queue import SimpleQueue, Empty
+import time
 
 from mobly import asserts
 
@@ -186,46 +187,60 @@ class EventStream(IEventStream, Closable):
         """
         logging.debug("assert_event_occurs_at_most")
         event_list = []
-        end_time = datetime.now() + timeout
-        while len(event_list) <= at_most_times and datetime.now() < end_time:
-            remaining = static_remaining_time_delta(end_time)
-            logging.debug("Waiting for event iteration (%fs remaining)" % (remaining.total_seconds()))
-            try:
-                current_event = self.event_queue.get(timeout=remaining.total_seconds())
-                if match_fn(current_event):
-                    event_list.append(current_event)
-            except Empty:
-                continue
-        logging.debug("Done waiting, got %d events" % len(event_list))
+        events = static_drain_events(self.event_queue, time.monotonic() + timeout.total_seconds())
+        while len(event_list) <= at_most_times:
+            current_event = next(events, None)
+            if current_event is None:
+                break
+            if match_fn(current_event):
+                event_list.append(current_event)
+        logging.debug("Done waiting, got %d events", len(event_list))
         asserts.assert_true(
             len(event_list) <= at_most_times,
             msg=("Expected at most %d events, but got %d" % (at_most_times, len(event_list))))
 
 
-def static_remaining_time_delta(end_time):
-    remaining = end_time - datetime.now()
-    if remaining < timedelta(milliseconds=0):
-        remaining = timedelta(milliseconds=0)
-    return remaining
+def static_drain_events(event_queue, end_time):
+    """
+    Generate events from event_queue until end_time, a time.monotonic()
+    timestamp. Only blocks when the queue
+    is empty, events that are already queued are drained without waiting.
+
+    Events are taken from the queue one at a time as the generator is advanced,
+    so whatever the caller does not consume stays queued for later assertions
+    """
+    while True:
+        remaining = end_time - time.monotonic()
+        if remaining <= 0:
+            return
+        logging.debug("Waiting for event (%fs remaining)", remaining)
+        try:
+            event = event_queue.get(timeout=remaining)
+        except Empty:
+            return
+        yield event
+        while time.monotonic() < end_time:
+            try:
+                event = event_queue.get_nowait()
+            except Empty:
+                break
+            yield event
 
 
 def NOT_FOR_YOU_assert_event_occurs(istream,
                                     match_fn,
                                     at_least_times=1,
                                     timeout=timedelta(seconds=DEFAULT_TIMEOUT_SECONDS)):
-    logging.debug("assert_event_occurs %d %fs" % (at_least_times, timeout.total_seconds()))
+    logging.debug("assert_event_occurs %d %fs", at_least_times, timeout.total_seconds())
     event_list = []
-    end_time = datetime.now() + timeout
-    while len(event_list) < at_least_times and datetime.now() < end_time:
-        remaining = static_remaining_time_delta(end_time)
-        logging.debug("Waiting for event (%fs remaining)" % (remaining.total_seconds()))
-        try:
-            current_event = istream.get_event_queue().get(timeout=remaining.total_seconds())
-            logging.debug("current_event: %s", current_event)
-            if match_fn(current_event):
-                event_list.append(current_event)
-        except Empty:
-            continue
+    events = static_drain_events(istream.get_event_queue(), time.monotonic() + timeout.total_seconds())
+    while len(event_list) < at_least_times:
+        current_event = next(events, None)
+        if current_event is None:
+            break
+        logging.debug("current_event: %s", current_event)
+        if match_fn(current_event):
+            event_list.append(current_event)
     logging.debug("Done waiting for event, received %d", len(event_list))
     asserts.assert_true(
         len(event_list) >= at_least_times,
@@ -236,21 +251,18 @@ def NOT_FOR_YOU_assert_all_events_occur(istream,
                                         match_fns,
                                         order_matters,
                                         timeout=timedelta(seconds=DEFAULT_TIMEOUT_SECONDS)):
-    logging.debug("assert_all_events_occur %fs" % timeout.total_seconds())
+    logging.debug("assert_all_events_occur %fs", timeout.total_seconds())
     pending_matches = list(match_fns)
     matched_order = []
-    end_time = datetime.now() + timeout
-    while len(pending_matches) > 0 and datetime.now() < end_time:
-        remaining = static_remaining_time_delta(end_time)
-        logging.debug("Waiting for event (%fs remaining)" % (remaining.total_seconds()))
-        try:
-            current_event = istream.get_event_queue().get(timeout=remaining.total_seconds())
-            for match_fn in pending_matches:
-                if match_fn(current_event):
-                    pending_matches.remove(match_fn)
-                    matched_order.append(match_fn)
-        except Empty:
-            continue
+    events = static_drain_events(istream.get_event_queue(), time.monotonic() + timeout.total_seconds())
+    while len(pending_matches) > 0:
+        current_event = next(events, None)
+        if current_event is None:
+            break
+        for match_fn in pending_matches:
+            if match_fn(current_event):
+                pending_matches.remove(match_fn)
+                matched_order.append(match_fn)
     logging.debug("Done waiting for event")
     asserts.assert_true(
         len(matched_order) == len(match_fns),
@@ -267,18 +279,15 @@ def NOT_FOR_YOU_assert_all_events_occur(istream,
 
 
 def NOT_FOR_YOU_assert_none_matching(istream, match_fn, timeout=timedelta(seconds=DEFAULT_TIMEOUT_SECONDS)):
-    logging.debug("assert_none_matching %fs" % (timeout.total_seconds()))
+    logging.debug("assert_none_matching %fs", timeout.total_seconds())
     event = None
-    end_time = datetime.now() + timeout
-    while event is None and datetime.now() < end_time:
-        remaining = static_remaining_time_delta(end_time)
-        logging.debug("Waiting for event (%fs remaining)" % (remaining.total_seconds()))
-        try:
-            current_event = istream.get_event_queue().get(timeout=remaining.total_seconds())
-            if match_fn(current_event):
-                event = current_event
-        except Empty:
-            continue
+    events = static_drain_events(istream.get_event_queue(), time.monotonic() + timeout.total_seconds())
+    while event is None:
+        current_event = next(events, None)
+        if current_event is None:
+            break
+        if match_fn(current_event):
+            event = current_event
     logging.debug("Done waiting for an event")
     if event is None:
         return  # Avoid an assert in MessageToString(None, ...)
@@ -286,7 +295,7 @@ def NOT_FOR_YOU_assert_none_matching(istream, match_fn, timeout=timedelta(second
 
 
 def NOT_FOR_YOU_assert_none(istream, timeout=timedelta(seconds=DEFAULT_TIMEOUT_SECONDS)):
-    logging.debug("assert_none %fs" % (timeout.total_seconds()))
+    logging.debug("assert_none %fs", timeout.total_seconds())
     try:
         event = istream.get_event_queue().get(timeout=timeout.total_seconds())
         asserts.assert_true(event is None, msg='Expected None, but got {}'.format(pretty_print(event)))
@@ -15,10 +15,6 @@
 #   limitations under the License.
 
 import importlib
-import logging
-import os
-import signal
-import subprocess
 import traceback
 
 from functools import wraps
@@ -28,14 +24,7 @@ from acts import asserts, signals
 from acts.context import get_current_context
 from acts.base_test import BaseTestClass
 
-from cert.async_subprocess_logger import AsyncSubprocessLogger
-from cert.os_utils import get_gd_root
-from cert.os_utils import read_crash_snippet_and_log_tail
-from cert.os_utils import is_subprocess_alive
-from cert.os_utils import make_ports_available
-from cert.os_utils import TerminalColor
 from cert.gd_device import MOBLY_CONTROLLER_CONFIG_NAME as CONTROLLER_CONFIG_NAME
-from facade import rootservice_pb2 as facade_rootservice
 from cert.gd_base_test_lib import setup_class_core
 from cert.gd_base_test_lib import teardown_class_core
 from cert.gd_base_test_lib import setup_test_core
@@ -14,15 +14,10 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-import importlib
 import logging
 import os
 import signal
 import subprocess
-import traceback
-
-from functools import wraps
-from grpc import RpcError
 
 from cert.async_subprocess_logger import AsyncSubprocessLogger
 from cert.os_utils import get_gd_root
@@ -30,7 +25,6 @@ from cert.os_utils import read_crash_snippet_and_log_tail
 from cert.os_utils import is_subprocess_alive
 from cert.os_utils import make_ports_available
 from cert.os_utils import TerminalColor
-from cert.gd_device import MOBLY_CONTROLLER_CONFIG_NAME as CONTROLLER_CONFIG_NAME
 from facade import rootservice_pb2 as facade_rootservice
 
 
@@ -65,7 +59,7 @@ def setup_class_core(dut_module, cert_module, verbose_mode, log_path_base, contr
 
         info['make_rootcanal_ports_available'] = make_ports_available((rootcanal_test_port, rootcanal_hci_port,
                                                                        rootcanal_link_layer_port))
-        if not make_ports_available((rootcanal_test_port, rootcanal_hci_port, rootcanal_link_layer_port)):
+        if not info['make_rootcanal_ports_available']:
             return info
 
         # Start root canal process
@@ -87,8 +81,7 @@ def setup_class_core(dut_module, cert_module, verbose_mode, log_path_base, contr
             info['is_rootcanal_process_started'] = False
             return info
         info['is_subprocess_alive'] = is_subprocess_alive(rootcanal_process)
-        if not is_subprocess_alive(rootcanal_process):
-            info['is_subprocess_alive'] = False
+        if not info['is_subprocess_alive']:
             return info
 
         info['rootcanal_logger'] = AsyncSubprocessLogger(
@@ -125,18 +118,24 @@ def teardown_class_core(rootcanal_running, rootcanal_process, rootcanal_logger,
 
 
 def setup_test_core(dut, cert, dut_module, cert_module):
-    dut.rootservice.StartStack(
+    # Devices live for the whole test class, restarting the stacks is what resets them between tests.
+    # Both stacks are independent, so start them concurrently
+    dut_start = dut.rootservice.StartStack.future(
         facade_rootservice.StartStackRequest(module_under_test=facade_rootservice.BluetoothModule.Value(dut_module),))
-    cert.rootservice.StartStack(
+    cert_start = cert.rootservice.StartStack.future(
         facade_rootservice.StartStackRequest(module_under_test=facade_rootservice.BluetoothModule.Value(cert_module),))
+    dut_start.result()
+    cert_start.result()
 
     dut.wait_channel_ready()
     cert.wait_channel_ready()
 
 
 def teardown_test_core(cert, dut):
-    cert.rootservice.StopStack(facade_rootservice.StopStackRequest())
-    dut.rootservice.StopStack(facade_rootservice.StopStackRequest())
+    cert_stop = cert.rootservice.StopStack.future(facade_rootservice.StopStackRequest())
+    dut_stop = dut.rootservice.StopStack.future(facade_rootservice.StopStackRequest())
+    cert_stop.result()
+    dut_stop.result()
 
 
 def dump_crashes_core(dut, cert, rootcanal_running, rootcanal_process, rootcanal_logpath):
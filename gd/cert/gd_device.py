@@ -15,11 +15,13 @@
 #   limitations under the License.
 
 from abc import ABC
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import inspect
 import logging
 import os
 import pathlib
+import re
 import shutil
 import signal
 import socket
@@ -64,6 +66,39 @@ from shim.facade import facade_pb2_grpc as shim_facade_pb2_grpc
 MOBLY_CONTROLLER_CONFIG_NAME = "GdDevice"
 ACTS_CONTROLLER_REFERENCE_NAME = "gd_devices"
 
+# Variables that can be used in a device cmd, such as $GD_ROOT or $(grpc_port)
+_CMD_VAR_PATTERN = re.compile(r"\$GD_ROOT|\$\([a-z_]+\)")
+
+# Request for RPCs that take no arguments, it is only ever serialized so a single instance can be shared
+_EMPTY = empty_proto.Empty()
+
+# Facades exchange many small messages over a local connection, channels are created without compression
+_GRPC_CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", 32 * 1024 * 1024),
+    ("grpc.max_receive_message_length", 32 * 1024 * 1024),
+]
+
+# Facade stubs exposed as attributes of GdDeviceBase, root server stubs are created in setup() while facade stubs
+# are only created the first time a test uses them
+_ROOT_SERVER_STUBS = (("rootservice", facade_rootservice_pb2_grpc.RootFacadeStub),)
+_FACADE_STUBS = {
+    "hal": hal_facade_pb2_grpc.HciHalFacadeStub,
+    "controller_read_only_property": facade_rootservice_pb2_grpc.ReadOnlyPropertyStub,
+    "hci": hci_facade_pb2_grpc.HciFacadeStub,
+    "l2cap": l2cap_facade_pb2_grpc.L2capClassicModuleFacadeStub,
+    "l2cap_le": l2cap_le_facade_pb2_grpc.L2capLeModuleFacadeStub,
+    "iso": iso_facade_pb2_grpc.IsoModuleFacadeStub,
+    "hci_acl_manager": acl_manager_facade_pb2_grpc.AclManagerFacadeStub,
+    "hci_le_acl_manager": le_acl_manager_facade_pb2_grpc.LeAclManagerFacadeStub,
+    "hci_le_initiator_address": le_initiator_address_facade_pb2_grpc.LeInitiatorAddressFacadeStub,
+    "hci_controller": controller_facade_pb2_grpc.ControllerFacadeStub,
+    "hci_le_advertising_manager": le_advertising_manager_facade_pb2_grpc.LeAdvertisingManagerFacadeStub,
+    "hci_le_scanning_manager": le_scanning_manager_facade_pb2_grpc.LeScanningManagerFacadeStub,
+    "neighbor": neighbor_facade_pb2_grpc.NeighborFacadeStub,
+    "security": security_facade_pb2_grpc.SecurityModuleFacadeStub,
+    "shim": shim_facade_pb2_grpc.ShimFacadeStub,
+}
+
 
 def create(configs):
     if not configs:
@@ -74,11 +109,18 @@ def create(configs):
 
 
 def destroy(devices):
-    for device in devices:
-        try:
-            device.teardown()
-        except:
-            logging.exception("[%s] Failed to clean up properly due to" % device.label)
+    if not devices:
+        return
+    # Devices only clean up their own processes and files, tear them down at the same time
+    with ThreadPoolExecutor(max_workers=len(devices)) as executor:
+        executor.map(_teardown_device, devices)
+
+
+def _teardown_device(device):
+    try:
+        device.teardown()
+    except:
+        logging.exception("[%s] Failed to clean up properly due to" % device.label)
 
 
 def get_info(devices):
@@ -86,13 +128,11 @@ def get_info(devices):
 
 
 def get_instances_with_configs(configs):
-    print(configs)
+    logging.debug("GdDevice configs: %s", configs)
     devices = []
     for config in configs:
-        resolved_cmd = []
-        for arg in config["cmd"]:
-            logging.debug(arg)
-            resolved_cmd.append(replace_vars(arg, config))
+        cmd_vars = get_cmd_vars(config)
+        resolved_cmd = [replace_vars(arg, cmd_vars) for arg in config["cmd"]]
         verbose_mode = bool(config.get('verbose_mode', False))
         if config.get("serial_number"):
             device = GdAndroidDevice(config["grpc_port"], config["grpc_root_server_port"], config["signal_port"],
@@ -107,7 +147,11 @@ def get_instances_with_configs(configs):
     return devices
 
 
-def replace_vars(string, config):
+def get_cmd_vars(config):
+    """
+    Resolve the values of variables used in a device cmd, once per device config
+    :return: variable to value dict to be used with replace_vars()
+    """
     serial_number = config.get("serial_number")
     if serial_number is None:
         serial_number = ""
@@ -116,12 +160,18 @@ def replace_vars(string, config):
         rootcanal_port = ""
     if serial_number == "DUT" or serial_number == "CERT":
         raise Exception("Did you forget to configure the serial number?")
-    return string.replace("$GD_ROOT", get_gd_root()) \
-                 .replace("$(grpc_port)", config.get("grpc_port")) \
-                 .replace("$(grpc_root_server_port)", config.get("grpc_root_server_port")) \
-                 .replace("$(rootcanal_port)", rootcanal_port) \
-                 .replace("$(signal_port)", config.get("signal_port")) \
-                 .replace("$(serial_number)", serial_number)
+    return {
+        "$GD_ROOT": get_gd_root(),
+        "$(grpc_port)": config.get("grpc_port"),
+        "$(grpc_root_server_port)": config.get("grpc_root_server_port"),
+        "$(rootcanal_port)": rootcanal_port,
+        "$(signal_port)": config.get("signal_port"),
+        "$(serial_number)": serial_number,
+    }
+
+
+def replace_vars(string, cmd_vars):
+    return _CMD_VAR_PATTERN.sub(lambda match: cmd_vars.get(match.group(0), match.group(0)), string)
 
 
 class GdDeviceBase(ABC):
@@ -166,14 +216,14 @@ class GdDeviceBase(ABC):
         self.log_path_base = get_current_context().get_full_output_path()
         self.test_runner_base_path = \
             get_current_context().get_base_output_path()
+        label_log_prefix = os.path.join(self.log_path_base, self.label + "_")
         self.backing_process_log_path = os.path.join(self.log_path_base,
                                                      '%s_%s_backing_logs.txt' % (self.type_identifier, self.label))
-        if "--btsnoop=" not in " ".join(cmd):
-            cmd.append("--btsnoop=%s" % os.path.join(self.log_path_base, '%s_btsnoop_hci.log' % self.label))
-        if "--btsnooz=" not in " ".join(cmd):
-            cmd.append("--btsnooz=%s" % os.path.join(self.log_path_base, '%s_btsnooz_hci.log' % self.label))
-        if "--btconfig=" not in " ".join(cmd):
-            cmd.append("--btconfig=%s" % os.path.join(self.log_path_base, '%s_bt_config.conf' % self.label))
+        present_flags = {arg.partition("=")[0] + "=" for arg in cmd}
+        for flag, file_name in (("--btsnoop=", "btsnoop_hci.log"), ("--btsnooz=", "btsnooz_hci.log"),
+                                ("--btconfig=", "bt_config.conf")):
+            if flag not in present_flags:
+                cmd.append(flag + label_log_prefix + file_name)
         self.cmd = cmd
         self.environment = os.environ.copy()
         if "cert" in self.label:
@@ -197,61 +247,94 @@ class GdDeviceBase(ABC):
             signal_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             signal_socket.bind(("localhost", self.signal_port))
             signal_socket.listen(1)
-            signal_socket.settimeout(300)  # 5 minute timeout for blocking socket operations
+            # Wake up every second to check that the backing process is still alive, for at most 5 minutes
+            signal_socket.settimeout(1)
 
             # Start backing process
             logging.debug("Running %s" % " ".join(self.cmd))
-            self.backing_process = subprocess.Popen(
-                self.cmd,
-                cwd=get_gd_root(),
-                env=self.environment,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True)
+            if self.verbose_mode:
+                self.backing_process = subprocess.Popen(
+                    self.cmd,
+                    cwd=get_gd_root(),
+                    env=self.environment,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    universal_newlines=True)
+            else:
+                # Nothing is echoed to stdout, let the backing process write its log file directly
+                with open(self.backing_process_log_path, 'w') as backing_process_log:
+                    self.backing_process = subprocess.Popen(
+                        self.cmd,
+                        cwd=get_gd_root(),
+                        env=self.environment,
+                        stdout=backing_process_log,
+                        stderr=subprocess.STDOUT)
             asserts.assert_true(self.backing_process, msg="Cannot start backing_process at " + " ".join(self.cmd))
             asserts.assert_true(
-                is_subprocess_alive(self.backing_process),
+                self.backing_process.poll() is None,
                 msg="backing_process stopped immediately after running " + " ".join(self.cmd))
 
             # Wait for process to be ready
             logging.debug("Waiting for backing_process accept.")
-            signal_socket.accept()
+            self.__wait_for_backing_process_signal(signal_socket, timeout_seconds=300)
 
-        self.backing_process_logger = AsyncSubprocessLogger(
-            self.backing_process, [self.backing_process_log_path],
-            log_to_stdout=self.verbose_mode,
-            tag=self.label,
-            color=self.terminal_color)
+        self.backing_process_logger = None
+        if self.verbose_mode:
+            self.backing_process_logger = AsyncSubprocessLogger(
+                self.backing_process, [self.backing_process_log_path],
+                log_to_stdout=self.verbose_mode,
+                tag=self.label,
+                color=self.terminal_color)
 
         # Setup gRPC management channels
-        self.grpc_root_server_channel = grpc.insecure_channel("localhost:%d" % self.grpc_root_server_port)
-        self.grpc_channel = grpc.insecure_channel("localhost:%d" % self.grpc_port)
+        self.grpc_root_server_channel = grpc.insecure_channel(
+            "localhost:%d" % self.grpc_root_server_port,
+            options=_GRPC_CHANNEL_OPTIONS,
+            compression=grpc.Compression.NoCompression)
+        self.grpc_channel = grpc.insecure_channel(
+            "localhost:%d" % self.grpc_port, options=_GRPC_CHANNEL_OPTIONS, compression=grpc.Compression.NoCompression)
 
         if self.verbose_mode:
             self.grpc_channel = grpc.intercept_channel(self.grpc_channel, LoggingClientInterceptor(self.label))
 
         # Establish services from facades
-        self.rootservice = facade_rootservice_pb2_grpc.RootFacadeStub(self.grpc_root_server_channel)
-        self.hal = hal_facade_pb2_grpc.HciHalFacadeStub(self.grpc_channel)
-        self.controller_read_only_property = facade_rootservice_pb2_grpc.ReadOnlyPropertyStub(self.grpc_channel)
-        self.hci = hci_facade_pb2_grpc.HciFacadeStub(self.grpc_channel)
-        self.l2cap = l2cap_facade_pb2_grpc.L2capClassicModuleFacadeStub(self.grpc_channel)
-        self.l2cap_le = l2cap_le_facade_pb2_grpc.L2capLeModuleFacadeStub(self.grpc_channel)
-        self.iso = iso_facade_pb2_grpc.IsoModuleFacadeStub(self.grpc_channel)
-        self.hci_acl_manager = acl_manager_facade_pb2_grpc.AclManagerFacadeStub(self.grpc_channel)
-        self.hci_le_acl_manager = le_acl_manager_facade_pb2_grpc.LeAclManagerFacadeStub(self.grpc_channel)
-        self.hci_le_initiator_address = le_initiator_address_facade_pb2_grpc.LeInitiatorAddressFacadeStub(
-            self.grpc_channel)
-        self.hci_controller = controller_facade_pb2_grpc.ControllerFacadeStub(self.grpc_channel)
-        self.hci_controller.GetMacAddressSimple = lambda: self.hci_controller.GetMacAddress(empty_proto.Empty()).address
-        self.hci_controller.GetLocalNameSimple = lambda: self.hci_controller.GetLocalName(empty_proto.Empty()).name
-        self.hci_le_advertising_manager = le_advertising_manager_facade_pb2_grpc.LeAdvertisingManagerFacadeStub(
-            self.grpc_channel)
-        self.hci_le_scanning_manager = le_scanning_manager_facade_pb2_grpc.LeScanningManagerFacadeStub(
-            self.grpc_channel)
-        self.neighbor = neighbor_facade_pb2_grpc.NeighborFacadeStub(self.grpc_channel)
-        self.security = security_facade_pb2_grpc.SecurityModuleFacadeStub(self.grpc_channel)
-        self.shim = shim_facade_pb2_grpc.ShimFacadeStub(self.grpc_channel)
+        for name, stub_class in _ROOT_SERVER_STUBS:
+            setattr(self, name, stub_class(self.grpc_root_server_channel))
+        for name in _FACADE_STUBS:
+            self.__dict__.pop(name, None)
+
+    def __getattr__(self, name):
+        """
+        Create facade stubs on first use, only called when name is not already an attribute
+        """
+        if name not in _FACADE_STUBS or "grpc_channel" not in self.__dict__:
+            raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+        stub = _FACADE_STUBS[name](self.grpc_channel)
+        if name == "hci_controller":
+            stub.GetMacAddressSimple = self.__get_mac_address_simple
+            stub.GetLocalNameSimple = self.__get_local_name_simple
+        setattr(self, name, stub)
+        return stub
+
+    def __get_mac_address_simple(self):
+        return self.hci_controller.GetMacAddress(_EMPTY).address
+
+    def __get_local_name_simple(self):
+        return self.hci_controller.GetLocalName(_EMPTY).name
+
+    def __wait_for_backing_process_signal(self, signal_socket, timeout_seconds):
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            try:
+                signal_socket.accept()
+                return
+            except socket.timeout:
+                asserts.assert_true(
+                    self.backing_process.poll() is None,
+                    msg="backing_process stopped before it was ready after running " + " ".join(self.cmd))
+                asserts.assert_true(
+                    time.monotonic() < deadline,
+                    msg="[%s] backing_process not ready after %d seconds" % (self.label, timeout_seconds))
 
     def get_crash_snippet_and_log_tail(self):
         if is_subprocess_alive(self.backing_process):
@@ -282,7 +365,8 @@ class GdDeviceBase(ABC):
                 return_code = -65536
         if return_code not in [-stop_signal, 0]:
             logging.error("backing process %s stopped with code: %d" % (self.label, return_code))
-        self.backing_process_logger.stop()
+        if self.backing_process_logger:
+            self.backing_process_logger.stop()
 
     def wait_channel_ready(self):
         future = grpc.channel_ready_future(self.grpc_channel)
@@ -358,28 +442,32 @@ class GdHostOnlyDevice(GdDeviceBase):
         shutil.move(profdata_path_tmp, profdata_path)
         coverage_result_path = pathlib.Path(self.test_runner_base_path).joinpath(
             "%s_%s_backing_process_coverage.json" % (self.type_identifier, self.label))
-        with coverage_result_path.open("w") as coverage_result_file:
-            result = subprocess.run(
+        coverage_summary_path = pathlib.Path(self.test_runner_base_path).joinpath(
+            "%s_%s_backing_process_coverage_summary.txt" % (self.type_identifier, self.label))
+        # Export and report only read the merged profdata, so they can run at the same time
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            export_future = executor.submit(
+                self.__run_llvm_cov,
                 [str(llvm_cov), "export", "--format=text", "--instr-profile", profdata_path, self.cmd[0]],
-                stderr=subprocess.PIPE,
-                stdout=coverage_result_file,
-                cwd=os.path.join(get_gd_root()))
+                coverage_result_path)
+            report_future = executor.submit(self.__run_llvm_cov,
+                                            [llvm_cov, "report", "--instr-profile", profdata_path, self.cmd[0]],
+                                            coverage_summary_path)
+        result = export_future.result()
         if result.returncode != 0:
             logging.warning("[%s] Failed to generated coverage report, cmd result: %r" % (self.label, result))
             coverage_result_path.unlink(missing_ok=True)
-            return
-        coverage_summary_path = pathlib.Path(self.test_runner_base_path).joinpath(
-            "%s_%s_backing_process_coverage_summary.txt" % (self.type_identifier, self.label))
-        with coverage_summary_path.open("w") as coverage_summary_file:
-            result = subprocess.run(
-                [llvm_cov, "report", "--instr-profile", profdata_path, self.cmd[0]],
-                stderr=subprocess.PIPE,
-                stdout=coverage_summary_file,
-                cwd=os.path.join(get_gd_root()))
+        result = report_future.result()
         if result.returncode != 0:
             logging.warning("[%s] Failed to generated coverage summary, cmd result: %r" % (self.label, result))
             coverage_summary_path.unlink(missing_ok=True)
 
+    @staticmethod
+    def __run_llvm_cov(llvm_cov_cmd, output_path):
+        with output_path.open("w") as output_file:
+            return subprocess.run(
+                llvm_cov_cmd, stderr=subprocess.PIPE, stdout=output_file, cwd=os.path.join(get_gd_root()))
+
     def setup(self):
         # Ensure ports are available
         # Only check on host only test, for Android devices, these ports will
@@ -14,9 +14,9 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+from functools import lru_cache
 import logging
 import bluetooth_packets_python3 as bt_packets
-import logging
 
 from bluetooth_packets_python3 import hci_packets
 from bluetooth_packets_python3.hci_packets import EventCode
@@ -27,6 +27,10 @@ from bluetooth_packets_python3.l2cap_packets import ConnectionResponseResult
 from bluetooth_packets_python3.l2cap_packets import InformationRequestInfoType
 from bluetooth_packets_python3.l2cap_packets import LeCreditBasedConnectionResponseResult
 
+# Fixed channels carrying L2CAP signalling commands
+_CLASSIC_SIGNALLING_CID = 1
+_LE_SIGNALLING_CID = 5
+
 
 class HciMatchers(object):
 
@@ -96,7 +100,7 @@ class HciMatchers(object):
 
     @staticmethod
     def _extract_matching_event(packet_bytes, event_code):
-        event = hci_packets.EventView(bt_packets.PacketViewLittleEndian(list(packet_bytes)))
+        event = hci_packets.EventView(bt_packets.PacketViewLittleEndian(packet_bytes))
         if event is None:
             return None
         if event_code is not None and event.GetEventCode() != event_code:
@@ -144,7 +148,7 @@ class HciMatchers(object):
 
     @staticmethod
     def LogEventCode():
-        return lambda event: logging.info("Received event: %x" % hci_packets.EventView(bt_packets.PacketViewLittleEndian(list(event.payload))).GetEventCode())
+        return lambda event: logging.info("Received event: %x" % hci_packets.EventView(bt_packets.PacketViewLittleEndian(event.payload)).GetEventCode())
 
     @staticmethod
     def LinkKeyRequest():
@@ -256,143 +260,179 @@ class NeighborMatchers(object):
 
 
 class L2capMatchers(object):
+    """
+    Matchers are pure functions of their arguments, so factories hand out a cached matcher for each set of arguments
+    """
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def ConnectionRequest(psm):
         return lambda packet: L2capMatchers._is_matching_connection_request(packet, psm)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def ConnectionResponse(scid):
         return lambda packet: L2capMatchers._is_matching_connection_response(packet, scid)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def ConfigurationResponse(result=ConfigurationResponseResult.SUCCESS):
         return lambda packet: L2capMatchers._is_matching_configuration_response(packet, result)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def ConfigurationRequest(cid=None):
         return lambda packet: L2capMatchers._is_matching_configuration_request_with_cid(packet, cid)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def ConfigurationRequestWithErtm():
         return lambda packet: L2capMatchers._is_matching_configuration_request_with_ertm(packet)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def ConfigurationRequestView(dcid):
         return lambda request_view: request_view.GetDestinationCid() == dcid
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def DisconnectionRequest(scid, dcid):
         return lambda packet: L2capMatchers._is_matching_disconnection_request(packet, scid, dcid)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def DisconnectionResponse(scid, dcid):
         return lambda packet: L2capMatchers._is_matching_disconnection_response(packet, scid, dcid)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def EchoResponse():
         return lambda packet: L2capMatchers._is_control_frame_with_code(packet, CommandCode.ECHO_RESPONSE)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def CommandReject():
         return lambda packet: L2capMatchers._is_control_frame_with_code(packet, CommandCode.COMMAND_REJECT)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def LeCommandReject():
         return lambda packet: L2capMatchers._is_le_control_frame_with_code(packet, LeCommandCode.COMMAND_REJECT)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def LeConnectionParameterUpdateRequest():
         return lambda packet: L2capMatchers._is_le_control_frame_with_code(
             packet, LeCommandCode.CONNECTION_PARAMETER_UPDATE_REQUEST)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def LeConnectionParameterUpdateResponse(result=l2cap_packets.ConnectionParameterUpdateResponseResult.ACCEPTED):
         return lambda packet: L2capMatchers._is_matching_connection_parameter_update_response(packet, result)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def CreditBasedConnectionRequest(psm):
         return lambda packet: L2capMatchers._is_matching_credit_based_connection_request(packet, psm)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def CreditBasedConnectionResponse(result=LeCreditBasedConnectionResponseResult.SUCCESS):
         return lambda packet: L2capMatchers._is_matching_credit_based_connection_response(packet, result)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def CreditBasedConnectionResponseUsedCid():
         return lambda packet: L2capMatchers._is_matching_credit_based_connection_response(
             packet, LeCreditBasedConnectionResponseResult.SOURCE_CID_ALREADY_ALLOCATED
         ) or L2capMatchers._is_le_control_frame_with_code(packet, LeCommandCode.COMMAND_REJECT)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def LeDisconnectionRequest(scid, dcid):
         return lambda packet: L2capMatchers._is_matching_le_disconnection_request(packet, scid, dcid)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def LeDisconnectionResponse(scid, dcid):
         return lambda packet: L2capMatchers._is_matching_le_disconnection_response(packet, scid, dcid)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def LeFlowControlCredit(cid):
         return lambda packet: L2capMatchers._is_matching_le_flow_control_credit(packet, cid)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def SFrame(req_seq=None, f=None, s=None, p=None):
         return lambda packet: L2capMatchers._is_matching_supervisory_frame(packet, req_seq, f, s, p)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def IFrame(tx_seq=None, payload=None, f=None):
         return lambda packet: L2capMatchers._is_matching_information_frame(packet, tx_seq, payload, f, fcs=False)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def IFrameWithFcs(tx_seq=None, payload=None, f=None):
         return lambda packet: L2capMatchers._is_matching_information_frame(packet, tx_seq, payload, f, fcs=True)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def IFrameStart(tx_seq=None, payload=None, f=None):
         return lambda packet: L2capMatchers._is_matching_information_start_frame(packet, tx_seq, payload, f, fcs=False)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def Data(payload):
-        return lambda packet: packet.GetPayload().GetBytes() == payload
+        return lambda packet: L2capMatchers._is_matching_payload(packet.GetPayload(), payload)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def FirstLeIFrame(payload, sdu_size):
         return lambda packet: L2capMatchers._is_matching_first_le_i_frame(packet, payload, sdu_size)
 
     # this is a hack - should be removed
     @staticmethod
+    @lru_cache(maxsize=256)
     def PartialData(payload):
         return lambda packet: payload in packet.GetPayload().GetBytes()
 
     # this is a hack - should be removed
     @staticmethod
+    @lru_cache(maxsize=256)
     def PacketPayloadRawData(payload):
         return lambda packet: payload in packet.payload
 
     # this is a hack - should be removed
     @staticmethod
+    @lru_cache(maxsize=256)
     def PacketPayloadWithMatchingPsm(psm):
         return lambda packet: None if psm != packet.psm else packet
 
     # this is a hack - should be removed
     @staticmethod
+    @lru_cache(maxsize=256)
     def PacketPayloadWithMatchingCid(cid):
         return lambda packet: None if cid != packet.fixed_cid else packet
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def ExtractBasicFrame(scid):
         return lambda packet: L2capMatchers._basic_frame_for(packet, scid)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def ExtractBasicFrameWithFcs(scid):
         return lambda packet: L2capMatchers._basic_frame_with_fcs_for(packet, scid)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def InformationRequestWithType(info_type):
         return lambda packet: L2capMatchers._information_request_with_type(packet, info_type)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def InformationResponseExtendedFeatures(supports_ertm=None,
                                             supports_streaming=None,
                                             supports_fcs=None,
@@ -404,13 +444,13 @@ class L2capMatchers(object):
     def _basic_frame(packet):
         if packet is None:
             return None
-        return l2cap_packets.BasicFrameView(bt_packets.PacketViewLittleEndian(list(packet.payload)))
+        return l2cap_packets.BasicFrameView(bt_packets.PacketViewLittleEndian(packet.payload))
 
     @staticmethod
     def _basic_frame_with_fcs(packet):
         if packet is None:
             return None
-        return l2cap_packets.BasicFrameWithFcsView(bt_packets.PacketViewLittleEndian(list(packet.payload)))
+        return l2cap_packets.BasicFrameWithFcsView(bt_packets.PacketViewLittleEndian(packet.payload))
 
     @staticmethod
     def _basic_frame_for(packet, scid):
@@ -421,13 +461,10 @@ class L2capMatchers(object):
 
     @staticmethod
     def _basic_frame_with_fcs_for(packet, scid):
-        frame = L2capMatchers._basic_frame(packet)
-        if frame.GetChannelId() != scid:
+        view = bt_packets.PacketViewLittleEndian(packet.payload)
+        if l2cap_packets.BasicFrameView(view).GetChannelId() != scid:
             return None
-        frame = L2capMatchers._basic_frame_with_fcs(packet)
-        if frame is None:
-            return None
-        return frame
+        return l2cap_packets.BasicFrameWithFcsView(view)
 
     @staticmethod
     def _information_frame(packet):
@@ -476,7 +513,7 @@ class L2capMatchers(object):
             return False
         if tx_seq is not None and frame.GetTxSeq() != tx_seq:
             return False
-        if payload is not None and frame.GetPayload().GetBytes() != payload:
+        if payload is not None and not L2capMatchers._is_matching_payload(frame.GetPayload(), payload):
             return False
         if f is not None and frame.GetF() != f:
             return False
@@ -492,7 +529,7 @@ class L2capMatchers(object):
             return False
         if tx_seq is not None and frame.GetTxSeq() != tx_seq:
             return False
-        if payload is not None and frame.GetPayload().GetBytes() != payload:
+        if payload is not None and not L2capMatchers._is_matching_payload(frame.GetPayload(), payload):
             return False
         if f is not None and frame.GetF() != f:
             return False
@@ -516,17 +553,23 @@ class L2capMatchers(object):
     @staticmethod
     def _is_matching_first_le_i_frame(packet, payload, sdu_size):
         first_le_i_frame = l2cap_packets.FirstLeInformationFrameView(packet)
-        return first_le_i_frame.GetPayload().GetBytes() == payload and first_le_i_frame.GetL2capSduLength() == sdu_size
+        return L2capMatchers._is_matching_payload(first_le_i_frame.GetPayload(),
+                                                  payload) and first_le_i_frame.GetL2capSduLength() == sdu_size
+
+    @staticmethod
+    def _is_matching_payload(payload_view, payload):
+        # Compare sizes first so that payloads of the wrong size are never copied out of the view
+        return payload_view.size() == len(payload) and payload_view.GetBytes() == payload
 
     @staticmethod
     def _control_frame(packet):
-        if packet.GetChannelId() != 1:
+        if packet.GetChannelId() != _CLASSIC_SIGNALLING_CID:
             return None
         return l2cap_packets.ControlView(packet.GetPayload())
 
     @staticmethod
     def _le_control_frame(packet):
-        if packet.GetChannelId() != 5:
+        if packet.GetChannelId() != _LE_SIGNALLING_CID:
             return None
         return l2cap_packets.LeControlView(packet.GetPayload())
 
@@ -546,11 +589,13 @@ class L2capMatchers(object):
 
     @staticmethod
     def _is_control_frame_with_code(packet, code):
-        return L2capMatchers.control_frame_with_code(packet, code) is not None
+        return packet.GetChannelId() == _CLASSIC_SIGNALLING_CID and l2cap_packets.ControlView(
+            packet.GetPayload()).GetCode() == code
 
     @staticmethod
     def _is_le_control_frame_with_code(packet, code):
-        return L2capMatchers.le_control_frame_with_code(packet, code) is not None
+        return packet.GetChannelId() == _LE_SIGNALLING_CID and l2cap_packets.LeControlView(
+            packet.GetPayload()).GetCode() == code
 
     @staticmethod
     def _is_matching_connection_request(packet, psm):
@@ -664,15 +709,11 @@ class L2capMatchers(object):
         if frame is None:
             return False
         features = l2cap_packets.InformationResponseExtendedFeaturesView(frame)
-        if supports_ertm is not None and features.GetEnhancedRetransmissionMode() != supports_ertm:
-            return False
-        if supports_streaming is not None and features.GetStreamingMode != supports_streaming:
-            return False
-        if supports_fcs is not None and features.GetFcsOption() != supports_fcs:
-            return False
-        if supports_fixed_channels is not None and features.GetFixedChannels() != supports_fixed_channels:
-            return False
-        return True
+        # Only features with an expectation are read from the view
+        expectations = ((supports_ertm, features.GetEnhancedRetransmissionMode),
+                        (supports_streaming, features.GetStreamingMode), (supports_fcs, features.GetFcsOption),
+                        (supports_fixed_channels, features.GetFixedChannels))
+        return all(expected is None or getter() == expected for expected, getter in expectations)
 
     @staticmethod
     def _is_matching_connection_parameter_update_response(packet, result):
@@ -699,6 +740,7 @@ class L2capMatchers(object):
                                                    response.GetDestinationCid() != 0)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def LinkSecurityInterfaceCallbackEvent(type):
         return lambda event: True if event.event_type == type else False
 
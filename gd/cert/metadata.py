@@ -63,8 +63,7 @@ def metadata(_do_not_use=None, pts_test_id=None, pts_test_name=None):
 
     # Create a dictionary of optional parameters
     values = locals()
-    args = {arg: values[arg] for arg in inspect.getfullargspec(metadata).args}
-    del args["_do_not_use"]
+    args = {arg: values[arg] for arg in _METADATA_ARGS}
 
     # Check if at least one optional parameter is valid
     if not any(args.values()):
@@ -76,3 +75,7 @@ def metadata(_do_not_use=None, pts_test_id=None, pts_test_name=None):
         return _fail_decorator("pts_test_id and pts_test_name must both " "be valid if one of them is valid")
 
     return test_info(**args)
+
+
+# Names of the optional metadata parameters of metadata(), resolved once instead of on every decoration
+_METADATA_ARGS = tuple(arg for arg in inspect.getfullargspec(metadata).args if arg != "_do_not_use")
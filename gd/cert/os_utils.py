@@ -14,6 +14,7 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+from functools import lru_cache
 import logging
 from pathlib import Path
 import psutil
@@ -46,11 +47,12 @@ def is_subprocess_alive(process, timeout_seconds=1):
         return True
 
 
+@lru_cache(maxsize=1)
 def get_gd_root():
     """
     Return the root of the GD test library
 
-    GD root is the parent directory of cert
+    GD root is the parent directory of cert, resolved once per process
     :return: root directory string of gd test library
     """
     return str(Path(__file__).absolute().parents[1])
@@ -143,12 +143,11 @@ class PyHci(Closable):
         return self.acl_stream
 
     def register_for_events(self, *event_codes):
-        for event_code in event_codes:
-            self.device.hci.RequestEvent(hci_facade.EventRequest(code=int(event_code)))
+        self.device.hci.RequestEvents(hci_facade.EventsRequest(codes=[int(event_code) for event_code in event_codes]))
 
     def register_for_le_events(self, *event_codes):
-        for event_code in event_codes:
-            self.device.hci.RequestLeSubevent(hci_facade.EventRequest(code=int(event_code)))
+        self.device.hci.RequestLeSubevents(
+            hci_facade.EventsRequest(codes=[int(event_code) for event_code in event_codes]))
 
     def send_command(self, command):
         self.device.hci.SendCommand(common.Data(payload=bytes(command.Serialize())))
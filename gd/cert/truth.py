@@ -79,21 +79,31 @@ class EventStreamSubject(ObjectSubject):
 
 class MultiMatchStreamSubject(object):
 
-    def __init__(self, stream, match_fns, timeout):
+    def __init__(self, stream, match_fns, timeout, continuation=None):
         self._stream = stream
         self._match_fns = match_fns
         self._timeout = timeout
+        self._continuation = continuation
 
     def inAnyOrder(self):
         NOT_FOR_YOU_assert_all_events_occur(self._stream, self._match_fns, order_matters=False, timeout=self._timeout)
-        return EventStreamContinuationSubject(self._stream)
+        return self.__continuation()
 
     def inOrder(self):
         NOT_FOR_YOU_assert_all_events_occur(self._stream, self._match_fns, order_matters=True, timeout=self._timeout)
-        return EventStreamContinuationSubject(self._stream)
+        return self.__continuation()
+
+    def __continuation(self):
+        if self._continuation is None:
+            self._continuation = EventStreamContinuationSubject(self._stream)
+        return self._continuation
 
 
 class EventStreamContinuationSubject(ObjectSubject):
+    """
+    Assertions chained after a previous one on the same stream. Chained calls
+    return this same subject instead of building a new one for every step
+    """
 
     def __init__(self, value):
         super().__init__(value)
@@ -103,17 +113,17 @@ class EventStreamContinuationSubject(ObjectSubject):
             raise signals.TestFailure("Must specify a match function")
         elif len(match_fns) == 1:
             NOT_FOR_YOU_assert_event_occurs(self._value, match_fns[0], at_least_times=at_least_times, timeout=timeout)
-            return EventStreamContinuationSubject(self._value)
+            return self
         else:
-            return MultiMatchStreamSubject(self._value, match_fns, timeout)
+            return MultiMatchStreamSubject(self._value, match_fns, timeout, continuation=self)
 
     def thenNone(self, *match_fns, timeout=DEFAULT_TIMEOUT):
         if len(match_fns) == 0:
             NOT_FOR_YOU_assert_none(self._value, timeout=timeout)
-            return EventStreamContinuationSubject(self._value)
+            return self
         elif len(match_fns) == 1:
             NOT_FOR_YOU_assert_none_matching(self._value, match_fns[0], timeout=timeout)
-            return EventStreamContinuationSubject(self._value)
+            return self
         else:
             raise signals.TestFailure("Cannot specify multiple match functions")
 
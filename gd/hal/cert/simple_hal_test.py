@@ -32,6 +32,10 @@ from bluetooth_packets_python3 import RawBuilder
 
 _GRPC_TIMEOUT = 10
 
+# Start of an Inquiry Result event: event code 0x02 with a 0x0f byte long payload
+_INQUIRY_RESULT_EVENT_HEADER = b'\x02\x0f'
+_CERT_ADVERTISING_DATA = b'Im_A_Cert'
+
 
 class SimpleHalTest(GdBaseTestClass):
 
@@ -75,9 +79,8 @@ class SimpleHalTest(GdBaseTestClass):
         lap.lap = 0x33
         self.dut_hal.send_hci_command(hci_packets.InquiryBuilder(lap, 0x30, 0xff))
 
-        assertThat(self.dut_hal.get_hci_event_stream()).emits(lambda packet: b'\x02\x0f' in packet.payload
-                                                              # Expecting an HCI Event (code 0x02, length 0x0f)
-                                                             )
+        assertThat(self.dut_hal.get_hci_event_stream()).emits(
+            lambda packet: _INQUIRY_RESULT_EVENT_HEADER in packet.payload)
 
     def test_le_ad_scan_cert_advertises(self):
         self.dut_hal.set_random_le_address('0D:05:04:03:02:01')
@@ -93,10 +96,10 @@ class SimpleHalTest(GdBaseTestClass):
             peer_address='A6:A5:A4:A3:A2:A1',
             tx_power=0x7f,
             sid=1)
-        advertisement.set_data(b'Im_A_Cert')
+        advertisement.set_data(_CERT_ADVERTISING_DATA)
         advertisement.start()
 
-        assertThat(self.dut_hal.get_hci_event_stream()).emits(lambda packet: b'Im_A_Cert' in packet.payload)
+        assertThat(self.dut_hal.get_hci_event_stream()).emits(lambda packet: _CERT_ADVERTISING_DATA in packet.payload)
 
         advertisement.stop()
 
@@ -134,7 +137,7 @@ class SimpleHalTest(GdBaseTestClass):
             peer_address='A6:A5:A4:A3:A2:A1',
             tx_power=0x7F,
             sid=0)
-        advertisement.set_data(b'Im_A_Cert')
+        advertisement.set_data(_CERT_ADVERTISING_DATA)
         advertisement.start()
 
         assertThat(self.cert_hal.get_hci_event_stream()).emits(HciMatchers.LeConnectionComplete())
@@ -90,6 +90,17 @@ class HciFacadeService : public HciFacade::Service {
     return ::grpc::Status::OK;
   }
 
+  ::grpc::Status RequestEvents(
+      ::grpc::ServerContext* context,
+      const ::bluetooth::hci::EventsRequest* events,
+      ::google::protobuf::Empty* response) override {
+    for (auto code : events->codes()) {
+      hci_layer_->RegisterEventHandler(
+          static_cast<EventCode>(code), facade_handler_->BindOn(this, &HciFacadeService::on_event));
+    }
+    return ::grpc::Status::OK;
+  }
+
   ::grpc::Status RequestLeSubevent(
       ::grpc::ServerContext* context,
       const ::bluetooth::hci::EventRequest* event,
@@ -99,6 +110,17 @@ class HciFacadeService : public HciFacade::Service {
     return ::grpc::Status::OK;
   }
 
+  ::grpc::Status RequestLeSubevents(
+      ::grpc::ServerContext* context,
+      const ::bluetooth::hci::EventsRequest* events,
+      ::google::protobuf::Empty* response) override {
+    for (auto code : events->codes()) {
+      hci_layer_->RegisterLeEventHandler(
+          static_cast<SubeventCode>(code), facade_handler_->BindOn(this, &HciFacadeService::on_le_subevent));
+    }
+    return ::grpc::Status::OK;
+  }
+
   ::grpc::Status StreamEvents(
       ::grpc::ServerContext* context,
       const ::google::protobuf::Empty* request,
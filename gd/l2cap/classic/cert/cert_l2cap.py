@@ -14,6 +14,8 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+from functools import lru_cache
+from functools import wraps
 import logging
 
 from cert.behavior import IHasBehaviors, SingleArgumentBehavior, ReplyStage
@@ -37,6 +39,20 @@ from cert.matchers import L2capMatchers
 from cert.captures import L2capCaptures
 
 
+def _cached_config_options(build_options):
+    """
+    Build each distinct configuration option list once. Callers get their own list of the shared option objects,
+    which must not be modified
+    """
+    build_options_once = lru_cache(maxsize=32)(lambda *args, **kwargs: tuple(build_options(*args, **kwargs)))
+
+    @wraps(build_options)
+    def config_options(*args, **kwargs):
+        return list(build_options_once(*args, **kwargs))
+
+    return config_options
+
+
 class CertL2capChannel(IEventStream):
 
     def __init__(self, device, scid, dcid, acl_stream, acl, control_channel, fcs=None):
@@ -281,6 +297,7 @@ class CertL2cap(Closable, IHasBehaviors):
         self.scid_to_channel[dcid].send_configuration_response(captured_request_view)
 
     @staticmethod
+    @_cached_config_options
     def config_option_basic_explicit(mtu=642):
         mtu_opt = l2cap_packets.MtuConfigurationOption()
         mtu_opt.mtu = mtu
@@ -289,12 +306,14 @@ class CertL2cap(Closable, IHasBehaviors):
         return [mtu_opt, rfc_opt]
 
     @staticmethod
+    @_cached_config_options
     def config_option_mtu_explicit(mtu=642):
         mtu_opt = l2cap_packets.MtuConfigurationOption()
         mtu_opt.mtu = mtu
         return [mtu_opt]
 
     @staticmethod
+    @_cached_config_options
     def config_option_ertm(mtu=642,
                            fcs=None,
                            max_transmit=10,
@@ -37,9 +37,20 @@ from l2cap.classic.cert.cert_l2cap import CertL2cap
 from l2cap.classic.facade_pb2 import RetransmissionFlowControlMode
 from neighbor.facade import facade_pb2 as neighbor_facade
 
-# Assemble a sample packet.
+# Assemble a sample packet. Builders only hold a reference to it, so a single instance is shared by every frame
 SAMPLE_PACKET_DATA = b"\x19\x26\x08\x17"
-SAMPLE_PACKET = RawBuilder([x for x in SAMPLE_PACKET_DATA])
+SAMPLE_PACKET = RawBuilder(SAMPLE_PACKET_DATA)
+
+_PAYLOAD_ABC102 = b'abc' * 34
+_PAYLOAD_A48 = b'a' * 48
+_PAYLOAD_A44 = b'a' * 44
+
+_ONE_SECOND = timedelta(seconds=1)
+_HALF_SECOND = timedelta(seconds=0.5)
+
+_ECHO_REQUEST = l2cap_packets.EchoRequestBuilder(100, RawBuilder([1, 2, 3]))
+# Command code ff, Signal id 01, size 0000
+_INVALID_COMMAND_PACKET = RawBuilder([0xff, 0x01, 0x00, 0x00])
 
 
 class L2capTestBase(GdBaseTestClass):
@@ -123,6 +134,13 @@ class L2capTestBase(GdBaseTestClass):
 
         return (dut_channel, cert_channel)
 
+    def _send_and_verify_i_frame(self, dut_channel, cert_channel, payload=b'abc', tx_seq=0, with_fcs=False):
+        dut_channel.send(payload)
+        if with_fcs:
+            assertThat(cert_channel).emits(L2capMatchers.IFrameWithFcs(tx_seq=tx_seq, payload=payload))
+        else:
+            assertThat(cert_channel).emits(L2capMatchers.IFrame(tx_seq=tx_seq, payload=payload))
+
 
 class L2capTest(L2capTestBase):
 
@@ -142,7 +160,7 @@ class L2capTest(L2capTestBase):
         i_frame = l2cap_packets.EnhancedInformationFrameBuilder(
             0x99, 0, Final.NOT_SET, 1, l2cap_packets.SegmentationAndReassembly.UNSEGMENTED, SAMPLE_PACKET)
         self.cert_l2cap.send_acl(i_frame)
-        assertThat(cert_channel).emitsNone(L2capMatchers.SFrame(req_seq=4), timeout=timedelta(seconds=1))
+        assertThat(cert_channel).emitsNone(L2capMatchers.SFrame(req_seq=4), timeout=_ONE_SECOND)
 
     def test_open_two_channels(self):
         self._setup_link_from_cert()
@@ -156,8 +174,7 @@ class L2capTest(L2capTestBase):
         (dut_channel, cert_channel) = self._open_channel_from_cert(
             mode=RetransmissionFlowControlMode.ERTM, fcs=FcsType.NO_FCS)
 
-        dut_channel.send(b'abc' * 34)
-        assertThat(cert_channel).emits(L2capMatchers.IFrame(tx_seq=0, payload=b'abc' * 34))
+        self._send_and_verify_i_frame(dut_channel, cert_channel, payload=_PAYLOAD_ABC102)
 
         cert_channel.send_i_frame(tx_seq=0, req_seq=1, payload=SAMPLE_PACKET)
         # todo verify received?
@@ -201,8 +218,8 @@ class L2capTest(L2capTestBase):
         self._setup_link_from_cert()
 
         (dut_channel, cert_channel) = self._open_channel_from_cert()
-        dut_channel.send(b'a' * 48)
-        assertThat(cert_channel).emits(L2capMatchers.Data(b'a' * 48))
+        dut_channel.send(_PAYLOAD_A48)
+        assertThat(cert_channel).emits(L2capMatchers.Data(_PAYLOAD_A48))
 
     @metadata(pts_test_id="L2CAP/COS/CED/BV-07-C", pts_test_name="Accept Disconnect")
     def test_accept_disconnect(self):
@@ -326,8 +343,8 @@ class L2capTest(L2capTestBase):
         (dut_channel,
          cert_channel) = self._open_channel_from_cert(req_config_options=CertL2cap.config_option_mtu_explicit(48))
 
-        dut_channel.send(b"a" * 44)
-        assertThat(cert_channel).emits(L2capMatchers.Data(b"a" * 44))
+        dut_channel.send(_PAYLOAD_A44)
+        assertThat(cert_channel).emits(L2capMatchers.Data(_PAYLOAD_A44))
 
     @metadata(pts_test_id="L2CAP/COS/CFD/BV-11-C", pts_test_name="Negotiation of Unsupported Parameter")
     def test_negotiation_of_unsupported_parameter(self):
@@ -382,21 +399,10 @@ class L2capTest(L2capTestBase):
         unknown_opt_hint.max_window_size = 20
         unknown_opt_hint.is_hint = l2cap_packets.ConfigurationOptionIsHint.OPTION_IS_A_HINT
 
-        configuration_option_attempts = [[unknown_opt], [unknown_opt, unknown_opt_hint], [
-            unknown_opt, unknown_opt, unknown_opt
-        ], [unknown_opt, unknown_opt_hint, unknown_opt_hint,
-            unknown_opt], [unknown_opt_hint, unknown_opt_hint, unknown_opt_hint, unknown_opt_hint, unknown_opt], [
-                unknown_opt, unknown_opt_hint, unknown_opt_hint, unknown_opt, unknown_opt_hint, unknown_opt_hint
-            ], [unknown_opt, unknown_opt, unknown_opt, unknown_opt, unknown_opt, unknown_opt, unknown_opt], [
-                unknown_opt_hint, unknown_opt_hint, unknown_opt_hint, unknown_opt_hint, unknown_opt_hint,
-                unknown_opt_hint, unknown_opt_hint, unknown_opt
-            ], [
-                unknown_opt_hint, unknown_opt_hint, unknown_opt_hint, unknown_opt_hint, unknown_opt_hint,
-                unknown_opt_hint, unknown_opt_hint, unknown_opt, unknown_opt
-            ], [
-                unknown_opt_hint, unknown_opt_hint, unknown_opt_hint, unknown_opt_hint, unknown_opt_hint,
-                unknown_opt_hint, unknown_opt_hint, unknown_opt_hint, unknown_opt_hint, unknown_opt
-            ]]
+        # M is the mandatory unknown option, H is the same option sent as a hint
+        options = {"M": unknown_opt, "H": unknown_opt_hint}
+        configuration_option_attempts = [[options[option] for option in pattern] for pattern in (
+            "M", "MH", "MMM", "MHHM", "HHHHM", "MHHMHH", "M" * 7, "H" * 7 + "M", "H" * 7 + "MM", "H" * 9 + "M")]
 
         for option_list in configuration_option_attempts:
             cert_channel.send_configure_request(option_list)
@@ -408,8 +414,7 @@ class L2capTest(L2capTestBase):
         Verify that the IUT responds to an echo request.
         """
         self._setup_link_from_cert()
-        echo_request = l2cap_packets.EchoRequestBuilder(100, RawBuilder([1, 2, 3]))
-        self.cert_l2cap.get_control_channel().send(echo_request)
+        self.cert_l2cap.get_control_channel().send(_ECHO_REQUEST)
 
         assertThat(self.cert_l2cap.get_control_channel()).emits(L2capMatchers.EchoResponse())
 
@@ -420,9 +425,7 @@ class L2capTest(L2capTestBase):
         """
         self._setup_link_from_cert()
 
-        # Command code ff, Signal id 01, size 0000
-        invalid_command_packet = RawBuilder([0xff, 0x01, 0x00, 0x00])
-        self.cert_l2cap.get_control_channel().send(invalid_command_packet)
+        self.cert_l2cap.get_control_channel().send(_INVALID_COMMAND_PACKET)
 
         assertThat(self.cert_l2cap.get_control_channel()).emits(L2capMatchers.CommandReject())
 
@@ -539,8 +542,7 @@ class L2capTest(L2capTestBase):
         (dut_channel, cert_channel) = self._open_channel_from_cert(
             mode=RetransmissionFlowControlMode.ERTM, fcs=FcsType.NO_FCS)
 
-        dut_channel.send(b'abc')
-        assertThat(cert_channel).emits(L2capMatchers.IFrame(tx_seq=0, payload=b'abc'))
+        self._send_and_verify_i_frame(dut_channel, cert_channel)
 
     @metadata(pts_test_id="L2CAP/FOC/BV-02-C", pts_test_name="Lower Tester Explicitly Requests FCS should be " "Used")
     def test_explicitly_request_use_FCS(self):
@@ -553,8 +555,7 @@ class L2capTest(L2capTestBase):
         (dut_channel, cert_channel) = self._open_channel_from_cert(
             mode=RetransmissionFlowControlMode.ERTM, fcs=FcsType.DEFAULT)
 
-        dut_channel.send(b'abc')
-        assertThat(cert_channel).emits(L2capMatchers.IFrameWithFcs(payload=b"abc"))
+        self._send_and_verify_i_frame(dut_channel, cert_channel, with_fcs=True)
 
     @metadata(pts_test_id="L2CAP/FOC/BV-03-C", pts_test_name="Lower Tester Implicitly Requests FCS should be " "Used")
     def test_implicitly_request_use_FCS(self):
@@ -569,8 +570,7 @@ class L2capTest(L2capTestBase):
             fcs=FcsType.DEFAULT,
             req_config_options=CertL2cap.config_option_ertm(fcs=FcsType.NO_FCS))
 
-        dut_channel.send(b'abc')
-        assertThat(cert_channel).emits(L2capMatchers.IFrameWithFcs(payload=b"abc"))
+        self._send_and_verify_i_frame(dut_channel, cert_channel, with_fcs=True)
 
     @metadata(pts_test_id="L2CAP/OFS/BV-01-C", pts_test_name="Sending I-Frames without FCS for ERTM")
     def test_sending_i_frames_without_fcs_for_ertm(self):
@@ -582,8 +582,7 @@ class L2capTest(L2capTestBase):
         (dut_channel, cert_channel) = self._open_channel_from_cert(
             mode=RetransmissionFlowControlMode.ERTM, fcs=FcsType.NO_FCS)
 
-        dut_channel.send(b'abc')
-        assertThat(cert_channel).emits(L2capMatchers.IFrame(tx_seq=0, payload=b"abc"))
+        self._send_and_verify_i_frame(dut_channel, cert_channel)
 
     @metadata(pts_test_id="L2CAP/OFS/BV-02-C", pts_test_name="Receiving I-Frames without FCS for ERTM")
     def test_receiving_i_frames_without_fcs_for_ertm(self):
@@ -608,8 +607,7 @@ class L2capTest(L2capTestBase):
         (dut_channel, cert_channel) = self._open_channel_from_cert(
             mode=RetransmissionFlowControlMode.ERTM, fcs=FcsType.DEFAULT)
 
-        dut_channel.send(b'abc')
-        assertThat(cert_channel).emits(L2capMatchers.IFrameWithFcs(tx_seq=0, payload=b"abc"))
+        self._send_and_verify_i_frame(dut_channel, cert_channel, with_fcs=True)
 
     @metadata(pts_test_id="L2CAP/OFS/BV-06-C", pts_test_name="Receiving I-Frames with FCS for ERTM")
     def test_receiving_i_frames_with_fcs_for_ertm(self):
@@ -636,19 +634,16 @@ class L2capTest(L2capTestBase):
         (dut_channel, cert_channel) = self._open_channel_from_cert(
             mode=RetransmissionFlowControlMode.ERTM, fcs=FcsType.NO_FCS)
 
+        # All three fit in the transmit window, so the DUT can send them before any is acknowledged
         dut_channel.send(b'abc')
-        assertThat(cert_channel).emits(L2capMatchers.IFrame(tx_seq=0, payload=b"abc"))
-
-        cert_channel.send_i_frame(tx_seq=0, req_seq=1, payload=SAMPLE_PACKET)
-
         dut_channel.send(b'abc')
-        assertThat(cert_channel).emits(L2capMatchers.IFrame(tx_seq=1, payload=b"abc"))
-
-        cert_channel.send_i_frame(tx_seq=1, req_seq=2, payload=SAMPLE_PACKET)
-
         dut_channel.send(b'abc')
-        assertThat(cert_channel).emits(L2capMatchers.PartialData(b"abc"))
+        assertThat(cert_channel).emits(
+            L2capMatchers.IFrame(tx_seq=0, payload=b"abc"), L2capMatchers.IFrame(tx_seq=1, payload=b"abc"),
+            L2capMatchers.IFrame(tx_seq=2, payload=b"abc")).inOrder()
 
+        cert_channel.send_i_frame(tx_seq=0, req_seq=1, payload=SAMPLE_PACKET)
+        cert_channel.send_i_frame(tx_seq=1, req_seq=2, payload=SAMPLE_PACKET)
         cert_channel.send_i_frame(tx_seq=2, req_seq=3, payload=SAMPLE_PACKET)
 
     @metadata(pts_test_id="L2CAP/ERM/BV-02-C", pts_test_name="Receive I-Frames")
@@ -691,7 +686,7 @@ class L2capTest(L2capTestBase):
             cert_channel.send_i_frame(tx_seq=i, req_seq=0, payload=SAMPLE_PACKET)
             assertThat(cert_channel).emits(L2capMatchers.SFrame(req_seq=i + 1))
 
-        assertThat(cert_channel).emitsNone(L2capMatchers.SFrame(req_seq=4), timeout=timedelta(seconds=1))
+        assertThat(cert_channel).emitsNone(L2capMatchers.SFrame(req_seq=4), timeout=_ONE_SECOND)
 
     @metadata(
         pts_test_id="L2CAP/ERM/BV-05-C",
@@ -740,8 +735,7 @@ class L2capTest(L2capTestBase):
         dut_channel.send(b'def')
 
         assertThat(cert_channel).emits(L2capMatchers.IFrame(tx_seq=0, payload=b'abc'))
-        assertThat(cert_channel).emitsNone(
-            L2capMatchers.IFrame(tx_seq=1, payload=b'abc'), timeout=timedelta(seconds=0.5))
+        assertThat(cert_channel).emitsNone(L2capMatchers.IFrame(tx_seq=1, payload=b'abc'), timeout=_HALF_SECOND)
 
         cert_channel.send_i_frame(tx_seq=0, req_seq=1, payload=SAMPLE_PACKET)
 
@@ -766,8 +760,7 @@ class L2capTest(L2capTestBase):
             req_config_options=config,
             rsp_config_options=config)
 
-        dut_channel.send(b'abc')
-        assertThat(cert_channel).emits(L2capMatchers.IFrame(tx_seq=0, payload=b'abc'))
+        self._send_and_verify_i_frame(dut_channel, cert_channel)
         cert_channel.send_i_frame(tx_seq=0, req_seq=1, payload=SAMPLE_PACKET)
 
         dut_channel.set_traffic_paused(True)
@@ -1034,8 +1027,7 @@ class L2capTest(L2capTestBase):
             req_config_options=config,
             rsp_config_options=config)
 
-        dut_channel.send(b'abc')
-        assertThat(cert_channel).emits(L2capMatchers.IFrame(tx_seq=0, payload=b'abc'))
+        self._send_and_verify_i_frame(dut_channel, cert_channel)
         cert_channel.send_i_frame(tx_seq=0, req_seq=1, payload=SAMPLE_PACKET)
 
         dut_channel.set_traffic_paused(True)
@@ -1126,7 +1118,7 @@ class L2capTest(L2capTestBase):
             L2capMatchers.SFrame(p=Poll.POLL)).inOrder()
 
         cert_channel.send_s_frame(req_seq=0, s=SupervisoryFunction.SELECT_REJECT)
-        assertThat(cert_channel).emitsNone(timeout=timedelta(seconds=0.5))
+        assertThat(cert_channel).emitsNone(timeout=_HALF_SECOND)
 
         cert_channel.send_s_frame(req_seq=0, s=SupervisoryFunction.SELECT_REJECT, f=Final.POLL_RESPONSE)
         assertThat(cert_channel).emits(L2capMatchers.IFrame(tx_seq=0))
@@ -1155,7 +1147,7 @@ class L2capTest(L2capTestBase):
             L2capMatchers.SFrame(p=l2cap_packets.Poll.POLL)).inOrder()
 
         cert_channel.send_s_frame(req_seq=0, s=SupervisoryFunction.REJECT)
-        assertThat(cert_channel).emitsNone(timeout=timedelta(seconds=0.5))
+        assertThat(cert_channel).emitsNone(timeout=_HALF_SECOND)
 
         # Send RR with F set
         cert_channel.send_s_frame(req_seq=0, s=SupervisoryFunction.REJECT, f=Final.POLL_RESPONSE)
@@ -1187,7 +1179,7 @@ class L2capTest(L2capTestBase):
 
         # Send SREJ with F not set
         cert_channel.send_s_frame(req_seq=0, s=SupervisoryFunction.SELECT_REJECT)
-        assertThat(cert_channel).emitsNone(timeout=timedelta(seconds=0.5))
+        assertThat(cert_channel).emitsNone(timeout=_HALF_SECOND)
 
         cert_channel.send_i_frame(tx_seq=0, req_seq=0, f=Final.POLL_RESPONSE, payload=SAMPLE_PACKET)
 
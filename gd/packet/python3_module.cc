@@ -87,18 +87,29 @@ PYBIND11_MODULE(bluetooth_packets_python3, m) {
   py::class_<Iterator<kLittleEndian>>(m, "IteratorLittleEndian");
   py::class_<Iterator<!kLittleEndian>>(m, "IteratorBigEndian");
   py::class_<PacketView<kLittleEndian>>(m, "PacketViewLittleEndian")
+      .def(py::init([](py::bytes bytes) {
+        // Copy straight from the bytes buffer, without going through a list of ints
+        char* buffer = nullptr;
+        ssize_t length = 0;
+        PyBytes_AsStringAndSize(bytes.ptr(), &buffer, &length);
+        auto bytes_shared = std::make_shared<std::vector<uint8_t>>(buffer, buffer + length);
+        return std::make_unique<PacketView<kLittleEndian>>(bytes_shared);
+      }))
       .def(py::init([](std::vector<uint8_t> bytes) {
         // Make a copy
         auto bytes_shared = std::make_shared<std::vector<uint8_t>>(bytes);
         return std::make_unique<PacketView<kLittleEndian>>(bytes_shared);
       }))
-      .def("GetBytes", [](const PacketView<kLittleEndian> view) {
-        std::string result;
-        for (auto byte : view) {
-          result += byte;
-        }
-        return py::bytes(result);
-      });
+      .def("GetBytes",
+           [](const PacketView<kLittleEndian>& view) {
+             std::string result;
+             result.reserve(view.size());
+             for (auto byte : view) {
+               result.push_back(byte);
+             }
+             return py::bytes(result);
+           })
+      .def("size", [](const PacketView<kLittleEndian>& view) { return view.size(); });
   py::class_<PacketView<!kLittleEndian>>(m, "PacketViewBigEndian").def(py::init([](std::vector<uint8_t> bytes) {
     // Make a copy
     auto bytes_shared = std::make_shared<std::vector<uint8_t>>(bytes);
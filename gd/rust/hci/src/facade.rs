@@ -5,7 +5,7 @@ use bt_common::GrpcFacade;
 use bt_facade_helpers::RxAdapter;
 use bt_facade_proto::common::Data;
 use bt_facade_proto::empty::Empty;
-use bt_facade_proto::hci_facade::EventRequest;
+use bt_facade_proto::hci_facade::{EventRequest, EventsRequest};
 use bt_facade_proto::hci_facade_grpc::{create_hci_facade, HciFacade};
 use bt_hal::AclHal;
 use bt_hal::IsoHal;
@@ -103,6 +103,16 @@ impl HciFacade for HciFacadeService {
         });
     }
 
+    fn request_events(&mut self, ctx: RpcContext<'_>, req: EventsRequest, sink: UnarySink<Empty>) {
+        let mut clone = self.clone();
+        ctx.spawn(async move {
+            for code in req.get_codes() {
+                clone.register_event(*code).await;
+            }
+            sink.success(Empty::default()).await.unwrap();
+        });
+    }
+
     fn request_le_subevent(
         &mut self,
         ctx: RpcContext<'_>,
@@ -116,6 +126,21 @@ impl HciFacade for HciFacadeService {
         });
     }
 
+    fn request_le_subevents(
+        &mut self,
+        ctx: RpcContext<'_>,
+        req: EventsRequest,
+        sink: UnarySink<Empty>,
+    ) {
+        let mut clone = self.clone();
+        ctx.spawn(async move {
+            for code in req.get_codes() {
+                clone.register_le_event(*code).await;
+            }
+            sink.success(Empty::default()).await.unwrap();
+        });
+    }
+
     fn send_acl(&mut self, ctx: RpcContext<'_>, mut packet: Data, sink: UnarySink<Empty>) {
         let acl_tx = self.acl_tx.clone();
         ctx.spawn(async move {